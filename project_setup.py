@@ -79,6 +79,25 @@ def setup(project: mlrun.projects.MlrunProject) -> mlrun.projects.MlrunProject:
         kind="serving",
     )
 
+    project.set_function(
+        func="src/cascade.py",
+        name="cascade-thresholds",
+        handler="fit_cascade_thresholds",
+        kind="job",
+        with_repo=True,
+    ).save()
+    project.set_function(
+        f"db://{project.name}/cascade-thresholds", name="cascade-thresholds"
+    )
+
+    _set_function(
+        project=project,
+        func="src/serving.py",
+        name="cascade-serving",
+        kind="serving",
+        image="mlrun/mlrun",
+    )
+
     # Set the training workflow:
     project.set_workflow("main", "src/train_workflow.py", embed=True)
 
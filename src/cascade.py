@@ -0,0 +1,108 @@
+# Copyright 2024 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+# Helper functions to fit the uncertainty band of a two-stage cascade:
+# the cheap model scores every transaction, scores below the band are
+# declared legitimate, scores above it are declared fraud and only the
+# scores inside the band are sent to the expensive model
+from typing import Tuple
+
+import mlrun
+import numpy as np
+from cloudpickle import load
+
+
+def fit_cascade_band(
+    scores: np.ndarray,
+    labels: np.ndarray,
+    target_recall: float = 0.99,
+    target_precision: float = 0.99,
+) -> Tuple[float, float]:
+    """
+    Fit the (low, high) uncertainty band of the cheap model scores
+
+    :param scores: The cheap model fraud probabilities
+    :param labels: The true labels (1 for fraud)
+    :param target_recall: The minimal share of the frauds that must score
+                          at or above `low` (i.e. not be skipped as legitimate)
+    :param target_precision: The minimal fraud precision of the scores above
+                             `high` (i.e. declared fraud without the expensive model)
+
+    :returns: The (low, high) thresholds
+    """
+    scores = np.asarray(scores, dtype=float)
+    labels = np.asarray(labels).astype(bool)
+    if scores.size == 0:
+        return 0.0, 1.0
+
+    # Lowest band edge keeping `target_recall` of the frauds above it
+    positive_scores = scores[labels]
+    if positive_scores.size == 0:
+        low = 0.0
+    else:
+        low = float(np.quantile(positive_scores, 1 - target_recall, method="lower"))
+
+    # Lowest band edge above which the cheap model alone is precise enough
+    high = 1.0
+    order = np.argsort(-scores, kind="stable")
+    sorted_scores = scores[order]
+    precision = np.cumsum(labels[order]) / np.arange(1, scores.size + 1)
+    # Only cut between distinct scores, so `score > high` is well defined
+    is_cut = np.append(sorted_scores[1:] != sorted_scores[:-1], True)
+    candidates = np.flatnonzero(is_cut & (precision >= target_precision))
+    if candidates.size:
+        high = float(np.nextafter(sorted_scores[candidates[-1]], -np.inf))
+
+    # Lowering `low` below the cut only keeps more frauds above it
+    return min(low, high), high
+
+
+def fit_cascade_thresholds(
+    context: mlrun.MLClientCtx,
+    dataset: mlrun.DataItem,
+    cheap_model: str,
+    label_column: str = "label",
+    target_recall: float = 0.99,
+    target_precision: float = 0.99,
+):
+    """
+    Fit the cascade thresholds of the cheap model on a labeled dataset
+
+    :param context: The MLRun context
+    :param dataset: The labeled dataset (e.g. the training test set)
+    :param cheap_model: The cheap model store uri
+    :param label_column: The label column name
+    :param target_recall: The minimal share of the frauds sent past the cheap model
+    :param target_precision: The minimal precision of the frauds declared
+                             by the cheap model alone
+    """
+    df = dataset.as_df()
+    labels = df.pop(label_column).values
+
+    model_file, _, _ = mlrun.artifacts.get_model(cheap_model, suffix=".pkl")
+    with open(model_file, "rb") as f:
+        model = load(f)
+    scores = model.predict_proba(df.values)[:, 1]
+
+    low, high = fit_cascade_band(scores, labels, target_recall, target_precision)
+    uncertain = (scores >= low) & (scores <= high)
+    context.log_results(
+        {
+            "cascade_low": low,
+            "cascade_high": high,
+            "cascade_uncertain_share": float(uncertain.mean()),
+        }
+    )
@@ -16,6 +16,7 @@
 
 import numpy as np
 from cloudpickle import load
+from mlrun.artifacts import get_model
 from mlrun.serving.v2_serving import V2ModelServer
 
 
@@ -33,3 +34,29 @@ class ClassifierModel(V2ModelServer):
         feats = np.asarray(body["inputs"])
         result: np.ndarray = self.model.predict(feats)
         return result.tolist()
+
+
+class CascadeClassifierModel(ClassifierModel):
+    """Two-stage cascade, the cheap model scores every sample and only the
+    samples inside its uncertainty band are sent to the expensive model"""
+
+    def load(self):
+        """load the expensive model, the cheap model and the band thresholds"""
+        super().load()
+        cheap_model_file, _, _ = get_model(
+            self.get_param("cheap_model_path"), ".pkl"
+        )
+        self.cheap_model = load(open(cheap_model_file, "rb"))
+        self.low = float(self.get_param("cascade_low", 0.0))
+        self.high = float(self.get_param("cascade_high", 1.0))
+
+    def predict(self, body: dict) -> list:
+        """Generate cascade predictions from sample"""
+        print(f"Input -> {body['inputs']}")
+        feats = np.asarray(body["inputs"])
+        scores = self.cheap_model.predict_proba(feats)[:, 1]
+        result = (scores > self.high).astype(int)
+        uncertain = (scores >= self.low) & (scores <= self.high)
+        if uncertain.any():
+            result[uncertain] = self.model.predict(feats[uncertain])
+        return result.tolist()
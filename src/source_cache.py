@@ -0,0 +1,162 @@
+# Copyright 2024 Iguazio
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+# Helper functions to load the raw source CSVs through a local Parquet cache,
+# each file is parsed once (per read options) into a typed, columnar file
+# keyed by its URL and checksum, later reads only touch the requested columns
+# and the row groups matching the filters
+import glob
+import hashlib
+import json
+import os
+from typing import List, Optional
+
+import fsspec
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow.fs import LocalFileSystem
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "demo-fraud")
+CATEGORICAL_COLUMNS = ["source", "category", "gender", "event"]
+
+
+def source_checksum(url: str) -> str:
+    """
+    Get the checksum of a source file from its metadata (no download)
+
+    :param url: The source file URL
+
+    :returns: The checksum
+    """
+    fs, path = fsspec.core.url_to_fs(url)
+    return f"{fs.checksum(path):x}"
+
+
+def cache_source(
+    url: str,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    sort_by: Optional[str] = "source",
+    row_group_size: int = 10000,
+    **read_csv_kwargs,
+) -> str:
+    """
+    Convert a source CSV into a cached Parquet file, unless already cached
+
+    The source checksum is looked up on every call (an fsspec `info`, i.e. a
+    HEAD request for remote URLs), when that fails the cached copy is used
+
+    :param url: The source CSV URL
+    :param cache_dir: The cache directory
+    :param sort_by: The column to sort the rows by, keeps the row groups
+                    statistics tight for filters on that column
+    :param row_group_size: The number of rows per Parquet row group
+    :param read_csv_kwargs: Extra `pd.read_csv` arguments (e.g. `parse_dates`)
+
+    :returns: The cached Parquet file path
+    """
+    # The same file read with different options gets a different cache entry
+    key = json.dumps([url, sort_by, read_csv_kwargs], sort_keys=True, default=str)
+    entry_dir = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest())
+    try:
+        checksum = source_checksum(url)
+    except Exception:
+        # The source is unreachable (offline, HEAD refused), use the cached copy
+        cached = sorted(
+            glob.glob(os.path.join(entry_dir, "*.parquet")), key=os.path.getmtime
+        )
+        if not cached:
+            raise
+        return cached[-1]
+    path = os.path.join(entry_dir, f"{checksum}.parquet")
+    if os.path.exists(path):
+        return path
+
+    df = pd.read_csv(url, **read_csv_kwargs)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    if sort_by:
+        df.sort_values(by=sort_by, axis=0, inplace=True, kind="stable")
+
+    # Write to a temporary file first so a failed conversion leaves no entry,
+    # and drop the entries of older versions of the source
+    os.makedirs(entry_dir, exist_ok=True)
+    for name in os.listdir(entry_dir):
+        os.remove(os.path.join(entry_dir, name))
+    pq.write_table(
+        pa.Table.from_pandas(df), path + ".tmp", row_group_size=row_group_size
+    )
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def load_source(
+    url: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[list] = None,
+    nrows: Optional[int] = None,
+    memory_map: bool = True,
+    categorical: bool = True,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    sort_by: Optional[str] = "source",
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """
+    Load a source CSV through the Parquet cache
+
+    :param url: The source CSV URL
+    :param columns: The columns to read (default all)
+    :param filters: Row filters pushed down to the Parquet scan, in the
+                    `pyarrow.parquet` format, e.g. `[("source", "in", ids),
+                    ("timestamp", ">=", pd.Timestamp("2020-01-01"))]`
+    :param nrows: Read only the first rows (in `sort_by` order)
+    :param memory_map: Memory-map the cached file instead of reading it
+    :param categorical: Return the `source`, `category`, `gender` and `event`
+                        columns as categoricals, otherwise as strings
+    :param cache_dir: The cache directory
+    :param sort_by: The column the cached rows are sorted by
+    :param read_csv_kwargs: Extra `pd.read_csv` arguments (e.g. `parse_dates`)
+
+    :returns: The loaded dataframe
+    """
+    path = cache_source(url, cache_dir, sort_by, **read_csv_kwargs)
+    dataset = ds.dataset(
+        path, format="parquet", filesystem=LocalFileSystem(use_mmap=memory_map)
+    )
+
+    # Keep the stored index columns (e.g. from `index_col`) on projection
+    if columns is not None:
+        index_columns = (dataset.schema.pandas_metadata or {}).get(
+            "index_columns", []
+        )
+        columns = list(columns) + [
+            c for c in index_columns if isinstance(c, str) and c not in columns
+        ]
+    expression = pq.filters_to_expression(filters) if filters else None
+    if nrows is None:
+        table = dataset.to_table(columns=columns, filter=expression)
+    else:
+        table = dataset.head(nrows, columns=columns, filter=expression)
+
+    df = table.to_pandas()
+    for column in df.select_dtypes("category").columns:
+        if categorical:
+            df[column] = df[column].cat.remove_unused_categories()
+        else:
+            df[column] = df[column].astype(object)
+    return df
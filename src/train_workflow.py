@@ -123,9 +123,49 @@ def pipeline(vector_name="transactions-fraud", features=[], label_column="is_err
         inputs={"dataset": train_run.outputs["test_set"]},
     ).after(train_run)
 
+    # Serve the selected best model, or in cascade mode let the cheap
+    # LogisticRegression screen every request and forward only the
+    # uncertain ones to the RandomForest
+    models = [{"key": "fraud", "model_path": train_run.outputs["model"]}]
+    serving_name = "serving"
+    deploy_after = train_run
+    if project.get_param("cascade", False):
+        cheap_model = project.get_artifact_uri(
+            "transaction_fraud_xgboost", category="model"
+        )
+        cascade_run = project.run_function(
+            project.get_function("cascade-thresholds"),
+            name="cascade-thresholds",
+            handler="fit_cascade_thresholds",
+            params={
+                "cheap_model": cheap_model,
+                "label_column": project.get_param("label_column", "label"),
+                "target_recall": project.get_param("cascade_target_recall", 0.99),
+                "target_precision": project.get_param(
+                    "cascade_target_precision", 0.99
+                ),
+            },
+            inputs={"dataset": train_run.outputs["test_set"]},
+            outputs=["cascade_low", "cascade_high"],
+        ).after(train_run)
+        models = [
+            {
+                "key": "fraud",
+                "model_path": project.get_artifact_uri(
+                    "transaction_fraud_rf", category="model"
+                ),
+                "class_name": "CascadeClassifierModel",
+                "cheap_model_path": cheap_model,
+                "cascade_low": str(cascade_run.outputs["cascade_low"]),
+                "cascade_high": str(cascade_run.outputs["cascade_high"]),
+            }
+        ]
+        serving_name = "cascade-serving"
+        deploy_after = cascade_run
+
     # Create a serverless function from the hub, add a feature enrichment router
     # This will enrich and impute the request with data from the feature vector
-    serving_func = project.get_function("serving")
+    serving_func = project.get_function(serving_name)
     serving_func.set_topology(
         "router",
         mlrun.serving.routers.EnrichmentModelRouter(
@@ -177,7 +217,4 @@ def pipeline(vector_name="transactions-fraud", features=[], label_column="is_err
 
     serving_func.save()
     # deploy the model server, pass a list of trained models to serve
-    project.deploy_function(
-        serving_func,
-        models=[{"key": "fraud", "model_path": train_run.outputs["model"]}],
-    ).after(train_run)
+    project.deploy_function(serving_func, models=models).after(deploy_after)
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from src.cascade import fit_cascade_band
+from src.serving import CascadeClassifierModel
+
+
+class CascadeTest(unittest.TestCase):
+    def test_fit_cascade_band(self):
+        scores, labels = self.get_data()
+        low, high = fit_cascade_band(
+            scores, labels, target_recall=0.75, target_precision=1.0
+        )
+        assert low <= high
+        # The band keeps at least 75% of the frauds out of the legitimate skip
+        assert (scores[labels == 1] >= low).mean() >= 0.75
+        # Everything above the band is fraud
+        assert labels[scores > high].all()
+        assert (scores > high).any()
+
+    def test_fit_cascade_band_no_frauds(self):
+        low, high = fit_cascade_band(np.array([0.1, 0.2]), np.array([0, 0]))
+        assert (low, high) == (0.0, 1.0)
+
+    def test_fit_cascade_band_precise_ties(self):
+        scores = np.array([0.9, 0.9])
+        low, high = fit_cascade_band(scores, np.array([1, 1]))
+        assert low <= high
+        assert (scores > high).all()
+
+    def test_cascade_predict(self):
+        server = self.get_server(low=0.2, high=0.8)
+        feats = [[0.1], [0.5], [0.9], [0.2], [0.8]]
+        result = server.predict({"inputs": feats})
+        # Below the band -> 0, above -> 1, inside -> the expensive model (7)
+        assert result == [0, 7, 1, 7, 7]
+        assert server.model.calls == [[[0.5], [0.2], [0.8]]]
+
+    def test_cascade_predict_no_uncertain(self):
+        server = self.get_server(low=0.4, high=0.6)
+        result = server.predict({"inputs": [[0.1], [0.9]]})
+        assert result == [0, 1]
+        assert server.model.calls == []
+
+    def get_server(self, low, high):
+        server = CascadeClassifierModel.__new__(CascadeClassifierModel)
+        server.cheap_model = CheapModel()
+        server.model = ExpensiveModel()
+        server.low, server.high = low, high
+        return server
+
+    def get_data(self):
+        scores = np.array([0.01, 0.05, 0.1, 0.2, 0.3, 0.4, 0.6, 0.7, 0.9, 0.95])
+        labels = np.array([0, 0, 1, 0, 0, 1, 0, 1, 1, 1])
+        return scores, labels
+
+
+class CheapModel:
+    """Scores each sample with its only feature"""
+
+    def predict_proba(self, feats):
+        scores = np.asarray(feats, dtype=float)[:, 0]
+        return np.stack([1 - scores, scores], axis=1)
+
+
+class ExpensiveModel:
+    """Predicts 7 for every sample and records its inputs"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, feats):
+        self.calls.append(np.asarray(feats).tolist())
+        return np.full(len(feats), 7)
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.source_cache import load_source
+
+
+class SourceCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        self.url = os.path.join(self.tmp_dir.name, "events.csv")
+        self.get_data().to_csv(self.url, quotechar="'")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def load(self, **kwargs):
+        return load_source(
+            self.url,
+            cache_dir=self.cache_dir,
+            index_col=0,
+            quotechar="'",
+            parse_dates=["timestamp"],
+            **kwargs,
+        )
+
+    def test_load_source(self):
+        df = self.load()
+        expected = self.get_data().sort_values(by="source", kind="stable")
+        assert df["source"].dtype == "category"
+        assert df["event"].dtype == "category"
+        assert df["timestamp"].dtype == "datetime64[ns]"
+        assert df["source"].tolist() == expected["source"].tolist()
+        assert df.index.tolist() == expected.index.tolist()
+        # The second read is served from the cache
+        assert len(os.listdir(self.cache_dir)) == 1
+        pd.testing.assert_frame_equal(self.load(), df)
+
+    def test_load_source_pushdown(self):
+        df = self.load(
+            columns=["source"],
+            filters=[
+                ("source", "in", ["C2", "C3"]),
+                ("timestamp", ">=", pd.Timestamp("2020-01-02")),
+            ],
+        )
+        assert df.columns.tolist() == ["source"]
+        assert df["source"].tolist() == ["C2", "C3"]
+        assert self.load(nrows=2)["source"].tolist() == ["C1", "C1"]
+
+    def test_load_source_not_categorical(self):
+        df = self.load(categorical=False)
+        assert df["source"].dtype == object
+        assert df["event"].dtype == object
+
+    def test_load_source_unsorted(self):
+        df = self.load(sort_by=None)
+        assert df["source"].tolist() == self.get_data()["source"].tolist()
+
+    def test_load_source_offline(self):
+        df = self.load()
+        # A warm cache is still served when the source is unreachable
+        os.remove(self.url)
+        pd.testing.assert_frame_equal(self.load(), df)
+
+    def test_load_source_merge(self):
+        transactions_url = os.path.join(self.tmp_dir.name, "data.csv")
+        pd.DataFrame(
+            {
+                "source": ["C1", "C4", "C2"],
+                "amount": [1.0, 2.0, 3.0],
+                "timestamp": pd.to_datetime(
+                    ["2020-01-05", "2020-01-05", "2020-01-05"]
+                ),
+            }
+        ).to_csv(transactions_url, index=False)
+        transactions = load_source(
+            transactions_url,
+            cache_dir=self.cache_dir,
+            parse_dates=["timestamp"],
+            categorical=False,
+        ).sort_values(by="timestamp")
+        events = self.load(categorical=False).sort_values(by="timestamp")
+
+        merged = pd.merge_asof(transactions, events, on="timestamp", by="source")
+        events_by_source = merged.set_index("source")["event"]
+        assert events_by_source["C1"] == "password_change"
+        assert events_by_source["C2"] == "login"
+        assert pd.isna(events_by_source["C4"])
+
+    def get_data(self):
+        return pd.DataFrame(
+            {
+                "source": ["C3", "C1", "C2", "C1", "C2"],
+                "event": [
+                    "login",
+                    "details_change",
+                    "login",
+                    "password_change",
+                    "login",
+                ],
+                "timestamp": pd.to_datetime(
+                    [
+                        "2020-01-03 10:00:00",
+                        "2020-01-01 10:00:00",
+                        "2020-01-02 10:00:00",
+                        "2020-01-04 10:00:00",
+                        "2020-01-01 12:00:00",
+                    ]
+                ),
+            },
+            index=[10, 11, 12, 13, 14],
+        )